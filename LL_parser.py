@@ -1,9 +1,44 @@
 import re
 import json
+from first_follow_scc import solve_first, solve_follow
+
+# Número mínimo de reglas para usar el solver paralelo por SCCs
+PARALLEL_THRESHOLD = 5000
+
+# Acciones de la tabla de recuperación de errores (get_recovery_matrix)
+RECOVERY_NONE, RECOVERY_EXT, RECOVERY_EP = 0, 1, 2
+RECOVERY_LABELS = ("-", "EXT", "EP")
+
+class LL1ConflictError(ValueError):
+    """Conflicto LL(1) encontrado con fail_fast=True; `conflict` tiene el detalle."""
+    def __init__(self, conflict):
+        self.conflict = conflict
+        rules = " / ".join(
+            f"{p['rule']['Izq']} -> {' '.join(p['rule']['Der'])} ({p['source']})"
+            for p in conflict["productions"]
+        )
+        super().__init__(f"Conflict in {conflict['nonterminal']} for terminal {conflict['terminal']}: {rules}")
+
+
+class BuildCancelled(Exception):
+    """La construcción se interrumpió porque cancel_check() devolvió True."""
+
 
 class LLParser:
-    def __init__(self, grammar_file="grammar.txt"):
+    def __init__(self, grammar_file="grammar.txt", parallel=False, workers=None,
+                 parallel_threshold=PARALLEL_THRESHOLD, grammar_text=None, fail_fast=False,
+                 cancel_check=None):
         self.grammar_file = grammar_file
+        # cancel_check() se consulta entre fases y en cada pasada de los
+        # puntos fijos; si devuelve True se lanza BuildCancelled
+        self.cancel_check = cancel_check
+        # Con fail_fast, build_parse_table lanza LL1ConflictError al primer conflicto
+        self.fail_fast = fail_fast
+        # Si se pasa el texto de la gramática, no se lee grammar_file
+        self.grammar_text = grammar_text
+        self.parallel = parallel
+        self.workers = workers
+        self.parallel_threshold = parallel_threshold
         self.variables = []
         self.terminales = []
         self.start = []
@@ -11,16 +46,34 @@ class LLParser:
         self.tabla = {}
         self.reglas = {}
         self.epsilon = 'ε'
+        self.table_version = 0
+        self._views = {}
+        self.conflicts = {}
         
         self.load_grammar()
+        self._check_cancel()
         self.process_grammar()
+        self._check_cancel()
         self.calculate_first()
+        self._check_cancel()
+        if self.fail_fast:
+            self._check_first_conflicts()
         self.calculate_follow()
+        self._check_cancel()
         self.build_parse_table()
-        
-    def load_grammar(self):
+
+    def _check_cancel(self):
+        if self.cancel_check is not None and self.cancel_check():
+            raise BuildCancelled()
+
+    def _grammar_lines(self):
+        if self.grammar_text is not None:
+            return self.grammar_text.splitlines()
         with open(self.grammar_file, "r") as archivo:
-            sent = archivo.readlines()
+            return archivo.readlines()
+
+    def load_grammar(self):
+        sent = self._grammar_lines()
         # Clean and process grammar lines
         rules = []
         for i in range(len(sent)):
@@ -66,7 +119,7 @@ class LLParser:
             self.grammar[j] = {"tipo": "T", "first": [j]}
         # Process rules
         rule_count = 1
-        for line in open(self.grammar_file, "r"):
+        for line in self._grammar_lines():
             line = line.strip()
             if not line or (not '->' in line and not '→' in line):
                 continue
@@ -90,13 +143,27 @@ class LLParser:
                 print(f"Skipping invalid line: '{line}'. Error: {e}")
                 continue
                 
+    def _use_parallel(self):
+        # Las gramáticas pequeñas siempre van por el camino secuencial
+        return self.parallel and len(self.reglas) >= self.parallel_threshold
+
     def calculate_first(self):
         # Inicializa FIRST para todos los símbolos
         for symbol in self.grammar:
             self.grammar[symbol]["first"] = []
+        if self._use_parallel():
+            rules = [(r["Izq"], r["Der"]) for r in self.reglas.values()]
+            firsts = solve_first(self.start + self.variables, rules,
+                                 self.terminales, self.epsilon, self.workers,
+                                 self._check_cancel)
+            for var, first in firsts.items():
+                self.grammar[var]["first"] = first
+            self._canonical_order("first")
+            return
         changed = True
         while changed:
             changed = False
+            self._check_cancel()
             for rule in self.reglas.values():
                 left = rule["Izq"]
                 right = rule["Der"]
@@ -129,6 +196,14 @@ class LLParser:
                     if self.epsilon not in self.grammar[left]["first"]:
                         self.grammar[left]["first"].append(self.epsilon)
                         changed = True
+        self._canonical_order("first")
+
+    def _canonical_order(self, key):
+        # Ordena FIRST/FOLLOW como los terminales de la gramática, luego '$' y
+        # ε, para que el solver secuencial y el paralelo den listas idénticas
+        rank = {t: i for i, t in enumerate(self.terminales + ["$", self.epsilon])}
+        for var in self.start + self.variables:
+            self.grammar[var][key].sort(key=rank.__getitem__)
 
     def calculate_follow(self):
         # Inicializa FOLLOW para todos los no terminales (incluyendo el símbolo de arranque)
@@ -139,9 +214,21 @@ class LLParser:
             # El símbolo de arranque siempre lleva '$' en su FOLLOW
             self.grammar[self.start[0]]["follow"] = ["$"]
 
+        if self._use_parallel():
+            rules = [(r["Izq"], r["Der"]) for r in self.reglas.values()]
+            firsts = {var: self.grammar[var]["first"] for var in nonterminals}
+            follows = solve_follow(nonterminals, self.start[0] if self.start else None,
+                                   rules, self.terminales, self.epsilon, firsts, self.workers,
+                                   self._check_cancel)
+            for var, follow in follows.items():
+                self.grammar[var]["follow"] = follow
+            self._canonical_order("follow")
+            return
+
         changed = True
         while changed:
             changed = False
+            self._check_cancel()
             for rule in self.reglas.values():
                 left = rule["Izq"]
                 right = rule["Der"]
@@ -188,61 +275,226 @@ class LLParser:
                                 if sym not in self.grammar[B]["follow"]:
                                     self.grammar[B]["follow"].append(sym)
                                     changed = True
+        self._canonical_order("follow")
+
+    def _rhs_first(self, right):
+        """
+        FIRST(der) de una producción: {terminal: prefijo anulable atravesado
+        hasta el símbolo que lo aporta} y si la derecha completa deriva ε.
+        """
+        first_paths = {}
+        if right == [self.epsilon]:
+            return first_paths, True
+        for i, symbol in enumerate(right):
+            if symbol in self.terminales:
+                first_paths.setdefault(symbol, right[:i])
+                return first_paths, False
+            elif symbol in self.grammar and self.grammar[symbol]["tipo"] == "V":
+                for s in self.grammar[symbol]["first"]:
+                    if s != self.epsilon:
+                        first_paths.setdefault(s, right[:i])
+                if self.epsilon not in self.grammar[symbol]["first"]:
+                    return first_paths, False
+            else:
+                return first_paths, False
+        return first_paths, True
+
+    def _check_first_conflicts(self):
+        """
+        Con fail_fast, busca conflictos FIRST/FIRST justo después de
+        calculate_first, sin esperar a FOLLOW ni a la tabla.
+        """
+        seen = {}
+        for rule in self.reglas.values():
+            left = rule["Izq"]
+            first_paths, _ = self._rhs_first(rule["Der"])
+            for terminal, path in first_paths.items():
+                key = (left, terminal)
+                entry = {"rule": rule, "source": "FIRST", "nullable_path": path}
+                if key in seen:
+                    self.conflicts[key] = [seen[key], entry]
+                    raise LL1ConflictError(self._conflict_info(key))
+                seen[key] = entry
 
     def build_parse_table(self):
-        # Inicializa la tabla de análisis LL(1) con tokens completos
-        for i in self.start + self.variables:
+        self.invalidate_views()
+        # Índice de conflictos: (A, t) -> lista de producciones en la celda
+        self.conflicts = {}
+        origins = {}
+        nonterminals = self.start + self.variables
+        # Las celdas se crean al usarlas; las vacías se completan al final,
+        # así fail_fast no paga la tabla densa si hay un conflicto
+        for i in nonterminals:
             self.tabla[i] = {}
-            for j in self.terminales + ["$"]:
-                self.tabla[i][j] = []
         # Llena la tabla de análisis
         for rule in self.reglas.values():
             left = rule["Izq"]
             right = rule["Der"]
-            # Calcula FIRST(der)
-            first_set = set()
-            add_epsilon = False
-            if right == [self.epsilon]:
-                add_epsilon = True
-            else:
-                for symbol in right:
-                    if symbol in self.terminales:
-                        first_set.add(symbol)
-                        break
-                    elif symbol in self.variables:
-                        first_set.update([s for s in self.grammar[symbol]["first"] if s != self.epsilon])
-                        if self.epsilon not in self.grammar[symbol]["first"]:
-                            break
-                    else:
-                        break
-                else:
-                    add_epsilon = True
+            first_paths, add_epsilon = self._rhs_first(right)
             # Para cada terminal en FIRST(der)\{ε}, agrega la regla
-            for terminal in first_set:
-                self.tabla[left][terminal].append(rule)
+            for terminal, path in first_paths.items():
+                self._add_table_entry(origins, left, terminal, rule, "FIRST", path)
             # Si FIRST(der) contiene ε, agrega la regla para cada símbolo en FOLLOW(left)
             if add_epsilon:
                 for follow_symbol in self.grammar[left]["follow"]:
-                    self.tabla[left][follow_symbol].append(rule)
+                    self._add_table_entry(origins, left, follow_symbol, rule, "FOLLOW", list(right))
+        # Completa la tabla LL(1) con todas las columnas, en orden
+        columns = self.terminales + ["$"]
+        for i in nonterminals:
+            row = self.tabla[i]
+            self.tabla[i] = {j: row.get(j) or [] for j in columns}
+
+    def _add_table_entry(self, origins, left, terminal, rule, source, nullable_path):
+        cell = self.tabla[left].setdefault(terminal, [])
+        key = (left, terminal)
+        if any(r is rule for r in cell):
+            # La misma regla llega por FIRST y por FOLLOW: no es un conflicto,
+            # se fusionan ambos orígenes en una sola entrada
+            entries = self.conflicts[key] if key in self.conflicts else [origins[key]]
+            for entry in entries:
+                if entry["rule"] is rule:
+                    entry["source"] = f"{entry['source']}+{source}"
+            return
+        entry = {"rule": rule, "source": source, "nullable_path": nullable_path}
+        cell.append(rule)
+        if len(cell) == 1:
+            origins[key] = entry
+            return
+        if key not in self.conflicts:
+            self.conflicts[key] = [origins.pop(key)]
+        self.conflicts[key].append(entry)
+        if self.fail_fast:
+            raise LL1ConflictError(self._conflict_info(key))
 
-    def get_parsing_table(self):
+    def _conflict_info(self, key):
+        left, terminal = key
+        return {"nonterminal": left, "terminal": terminal, "productions": self.conflicts[key]}
+
+    def get_conflicts(self, nonterminal=None, terminal=None):
         """
-        Devuelve la cabecera y las filas de la tabla LL(1) de análisis.
+        Devuelve los conflictos LL(1) registrados al construir la tabla.
+        Cada conflicto es un dict con 'nonterminal', 'terminal' y
+        'productions'; cada producción indica la regla, si entró por FIRST o
+        por FOLLOW, y el camino anulable ('nullable_path') que la llevó ahí.
         """
+        return [
+            self._conflict_info(key)
+            for key in self.conflicts
+            if (nonterminal is None or key[0] == nonterminal)
+            and (terminal is None or key[1] == terminal)
+        ]
+
+    def is_ll1(self):
+        return not self.conflicts
+
+    # ——— Vistas cacheadas de las tablas ———
+    # Se cachean las celdas, las columnas completas y la matriz de
+    # recuperación, una vez por versión de la tabla (table_version, que sube
+    # en cada build_parse_table). Los métodos devuelven siempre listas nuevas
+    # o estructuras inmutables, así que el caché no se puede alterar desde
+    # fuera. Si se modifica self.tabla a mano hay que llamar a
+    # invalidate_views().
+    def invalidate_views(self):
+        self.table_version += 1
+        self._views = {}
+
+    def _view(self, key, build):
+        if key not in self._views:
+            self._views[key] = build()
+        return self._views[key]
+
+    def _axes(self, rows=None, cols=None):
         variables = self.start + self.variables
         terminals = self.terminales + ["$"]
-        header = ["NT"] + terminals
-        rows = []
-        for A in variables:
-            row = [A]
-            for t in terminals:
-                prods = self.tabla[A].get(t, [])
-                cell = " / ".join(f"{r['Izq']}→{''.join(r['Der'])}" for r in prods) if prods else "-"
-                row.append(cell)
-            rows.append(row)
-        return header, rows
-
-    def get_error_recovery_table(self):
+        if rows is not None:
+            variables = variables[rows]
+        if cols is not None:
+            terminals = terminals[cols]
+        return variables, terminals
+
+    def _cell_text(self, A, t, multiline=False):
+        cells = self._view(("cells", multiline), dict)
+        key = (A, t)
+        if key not in cells:
+            prods = self.tabla[A].get(t, [])
+            if not prods:
+                cells[key] = "-"
+            elif multiline:
+                cells[key] = "\n".join(f"{r['Izq']}→{' '.join(r['Der'])}" for r in prods)
+            else:
+                cells[key] = " / ".join(f"{r['Izq']}→{''.join(r['Der'])}" for r in prods)
+        return cells[key]
+
+    def _parsing_column(self, t, multiline=False):
+        # Columna completa de un terminal (tupla, para que no se pueda mutar)
+        return self._view(
+            ("column", t, multiline),
+            lambda: tuple(self._cell_text(A, t, multiline) for A in self.start + self.variables),
+        )
+
+    def get_parsing_columns(self, rows=None, cols=None, multiline=False):
+        """
+        Vista por columnas de la tabla LL(1), lista para pd.DataFrame:
+        {"NT": [...], terminal: [...], ...}. `rows` y `cols` son slices sobre
+        los no terminales y los terminales; con `rows` sólo se generan esas
+        celdas. Con multiline=True las celdas usan el formato de la GUI
+        (una producción por línea, símbolos separados por espacios).
+        """
+        variables, terminals = self._axes(rows, cols)
+        columns = {"NT": list(variables)}
+        for t in terminals:
+            if rows is None:
+                columns[t] = list(self._parsing_column(t, multiline))
+            else:
+                columns[t] = [self._cell_text(A, t, multiline) for A in variables]
+        return columns
+
+    def get_parsing_table(self, rows=None, cols=None, multiline=False):
+        """
+        Devuelve la cabecera y las filas de la tabla LL(1) de análisis.
+        """
+        columns = self.get_parsing_columns(rows, cols, multiline)
+        return list(columns), [list(r) for r in zip(*columns.values())]
+
+    def get_recovery_matrix(self):
+        """
+        Matriz de acciones de recuperación: (no terminales, terminales, filas)
+        como tuplas; cada fila es un bytes con RECOVERY_NONE, RECOVERY_EXT o
+        RECOVERY_EP por terminal.
+        """
+        def build():
+            variables, terminals = self._axes()
+            matrix = []
+            for A in variables:
+                firstA  = set(self.grammar[A]["first"])
+                followA = set(self.grammar[A]["follow"])
+                row = bytearray(len(terminals))
+                for j, t in enumerate(terminals):
+                    if t in followA:
+                        row[j] = RECOVERY_EXT
+                    elif t not in firstA:
+                        row[j] = RECOVERY_EP
+                matrix.append(bytes(row))
+            return tuple(variables), tuple(terminals), tuple(matrix)
+        return self._view("recovery_matrix", build)
+
+    def get_error_recovery_columns(self, rows=None, cols=None):
+        """
+        Vista por columnas de la tabla de recuperación (ver get_parsing_columns).
+        """
+        variables, terminals, matrix = self.get_recovery_matrix()
+        index = range(len(variables))
+        col_index = range(len(terminals))
+        if rows is not None:
+            index = index[rows]
+        if cols is not None:
+            col_index = col_index[cols]
+        columns = {"NT": [variables[i] for i in index]}
+        for j in col_index:
+            columns[terminals[j]] = [RECOVERY_LABELS[matrix[i][j]] for i in index]
+        return columns
+
+    def get_error_recovery_table(self, rows=None, cols=None):
         """
         Devuelve la cabecera y las filas de la tabla de recuperación de errores (panic mode).
         Marca:
@@ -250,26 +502,8 @@ class LLParser:
             – EP  (explore) si no está ni en First(A) ni en Follow(A)
             – '-' en caso contrario
         """
-        variables = self.start + self.variables
-        terminals = self.terminales + ["$"]
-        header = ["NT"] + terminals
-        rows = []
-
-        for A in variables:
-            firstA  = set(self.grammar[A]["first"])
-            followA = set(self.grammar[A]["follow"])
-            row = [A]
-            for t in terminals:
-                if t in followA:
-                    cell = "EXT"
-                elif t not in firstA and t not in followA:
-                    cell = "EP"
-                else:
-                    cell = "-"
-                row.append(cell)
-            rows.append(row)
-
-        return header, rows
+        columns = self.get_error_recovery_columns(rows, cols)
+        return list(columns), [list(r) for r in zip(*columns.values())]
 
     def analyze_string(self, input_string):
         # 1) Tokenizamos y preparamos pila
@@ -1,3 +1,4 @@
+import hashlib
 import streamlit as st
 import pandas as pd
 import matplotlib.pyplot as plt
@@ -9,43 +10,86 @@ from itertools import count
 st.set_page_config(layout="wide")
 st.title("LL(1) Parser Analyzer")
 
+PAGE_SIZES = [25, 50, 100, 500]
+
+
+# ——— Caché ———
+@st.cache_resource(max_entries=16)
+def get_parser(grammar_hash, _grammar_text):
+    """Un LLParser compilado por gramática (clave: hash del texto)."""
+    return LLParser(grammar_text=_grammar_text)
+
+
+@st.cache_resource(max_entries=256)
+def analyze(grammar_hash, _grammar_text, input_str):
+    """
+    LRU acotado de resultados de analyze_string por (gramática, entrada).
+    cache_resource devuelve el mismo objeto sin copiarlo, así que cada rerun
+    sólo paga por la página que se muestra; la traza es una tupla para que
+    ninguna sesión pueda modificarla.
+    """
+    valid, steps = get_parser(grammar_hash, _grammar_text).analyze_string(input_str)
+    return valid, tuple(steps)
+
+
+def paginate(total, load, key, height=400):
+    """
+    Muestra sólo una página: `load(slice)` devuelve el DataFrame de esas
+    filas, así nunca se genera la tabla completa.
+    """
+    cols = st.columns([1, 1, 4])
+    size = cols[0].selectbox("Rows per page", PAGE_SIZES, key=f"{key}_size")
+    pages = max(1, -(-total // size))
+    page = cols[1].number_input("Page", min_value=1, max_value=pages, value=1, key=f"{key}_page")
+    cols[2].caption(f"{total} rows · page {page} of {pages}")
+    start = (page - 1) * size
+    st.dataframe(load(slice(start, start + size)), height=height, use_container_width=True)
+
+
 # ——— 1) Gramática ———
+if "grammar" not in st.session_state:
+    with open("grammar.txt") as f:
+        st.session_state["grammar"] = f.read()
+
 st.sidebar.header("1. Grammar")
 grammar_text = st.sidebar.text_area(
     "Define your grammar here (→ or ->, one rule per line):",
-    value=open("grammar.txt").read(),
+    value=st.session_state["grammar"],
     height=200
 )
 if st.sidebar.button("Reload Grammar"):
-    with open("grammar.txt", "w") as f:
-        f.write(grammar_text)
-    st.sidebar.success("Grammar saved")
-parser = LLParser("grammar.txt")
+    st.session_state["grammar"] = grammar_text
+    st.session_state.pop("analyzed_input", None)
+    st.sidebar.success("Grammar loaded")
+
+grammar = st.session_state["grammar"]
+grammar_hash = hashlib.sha256(grammar.encode("utf-8")).hexdigest()
+parser = get_parser(grammar_hash, grammar)
 
 # ——— 2) Mostrar tablas ———
 st.sidebar.header("2. Tables")
 show_parse = st.sidebar.checkbox("Show Parse Table")
 show_errrec = st.sidebar.checkbox("Show Error-Recovery Table")
 
+n_rows = len(parser.start + parser.variables)
+
 if show_parse:
-    header, rows = parser.get_parsing_table()
-    df = pd.DataFrame(rows, columns=header)
     st.subheader("LL(1) Parsing Table")
-    st.dataframe(df.style.set_properties(**{"text-align": "center"}), height=400)
+    paginate(n_rows, lambda rows: pd.DataFrame(parser.get_parsing_columns(rows=rows)), "parse_table")
 
 if show_errrec:
-    header, rows = parser.get_error_recovery_table()
-    df2 = pd.DataFrame(rows, columns=header)
     st.subheader("LL(1) Error-Recovery Table")
-    st.dataframe(df2.style.set_properties(**{"text-align": "center"}), height=400)
+    paginate(n_rows, lambda rows: pd.DataFrame(parser.get_error_recovery_columns(rows=rows)), "errrec_table")
 
 # ——— 3) Análisis de cadena ———
 st.sidebar.header("3. Analyze String")
 input_str = st.sidebar.text_input("Input tokens (space-separated):", value="id + id")
 if st.sidebar.button("Analyze"):
-    valid, steps = parser.analyze_string(input_str)
+    st.session_state["analyzed_input"] = input_str
+
+if "analyzed_input" in st.session_state:
+    valid, steps = analyze(grammar_hash, grammar, st.session_state["analyzed_input"])
     st.subheader("Result")
     st.markdown(f"**Valid:** {'✅' if valid else '❌'}")
-    df_steps = pd.DataFrame(steps, columns=["Stack", "Input", "Rule"])
     st.subheader("Trace")
-    st.table(df_steps)
+    paginate(len(steps), lambda rows: pd.DataFrame(list(steps[rows]), columns=["Stack", "Input", "Rule"]), "trace")
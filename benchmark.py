@@ -0,0 +1,74 @@
+"""
+Benchmark del cálculo de FIRST/FOLLOW con el solver paralelo por SCCs.
+
+El speedup se mide contra el mismo solver con un solo proceso (scc x1), así
+que refleja el escalado con núcleos. La línea "secuencial" es el punto fijo
+original de LLParser y sólo sirve de referencia del algoritmo.
+
+Uso:
+    python benchmark.py [bloques] [profundidad]
+"""
+import os
+import sys
+import tempfile
+import time
+from LL_parser import LLParser
+
+
+def synthetic_grammar(blocks, depth):
+    """
+    Genera `blocks` sub-gramáticas de expresiones independientes entre sí,
+    cada una con una cadena de `depth` niveles de precedencia. Cada bloque
+    usa sus propios paréntesis e identificador (lp{b}, rp{b}, id{b}), así que
+    las alternativas de S empiezan por terminales distintos y la gramática
+    es LL(1).
+    """
+    lines = ["S -> " + " | ".join(f"E{b}_0" for b in range(blocks))]
+    for b in range(blocks):
+        for d in range(depth):
+            cur, nxt = f"E{b}_{d}", f"E{b}_{d + 1}"
+            lines.append(f"{cur} -> {nxt} {cur}R")
+            lines.append(f"{cur}R -> op{b}_{d} {nxt} {cur}R | ε")
+        last = f"E{b}_{depth}"
+        lines.append(f"{last} -> lp{b} E{b}_0 rp{b} | id{b}")
+    return "\n".join(lines) + "\n"
+
+
+def run(parser, parallel, workers):
+    parser.parallel = parallel
+    parser.workers = workers
+    parser.parallel_threshold = 0
+    t0 = time.perf_counter()
+    parser.calculate_first()
+    parser.calculate_follow()
+    elapsed = time.perf_counter() - t0
+    sets = {k: (list(v["first"]), list(v.get("follow", []))) for k, v in parser.grammar.items()}
+    return elapsed, sets
+
+
+def main():
+    blocks = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    depth = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False, encoding="utf-8") as f:
+        f.write(synthetic_grammar(blocks, depth))
+        path = f.name
+    try:
+        parser = LLParser(path)
+        print(f"Reglas: {len(parser.reglas)}  No terminales: {len(parser.start + parser.variables)}")
+        print(f"LL(1): {parser.is_ll1()}")
+        seq, expected = run(parser, False, None)
+        print(f"{'secuencial':<14} {seq:8.3f}s  (referencia, otro algoritmo)")
+        base = None
+        workers = 1
+        while workers <= (os.cpu_count() or 1):
+            elapsed, sets = run(parser, True, workers)
+            base = base or elapsed
+            status = "ok" if sets == expected else "DIFERENTE"
+            print(f"{'scc x' + str(workers):<14} {elapsed:8.3f}s  speedup vs x1 {base / elapsed:5.2f}  {status}")
+            workers *= 2
+    finally:
+        os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
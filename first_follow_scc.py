@@ -0,0 +1,317 @@
+"""
+Cálculo de FIRST y FOLLOW sobre el DAG de componentes fuertemente conexas.
+
+El grafo de dependencias entre no terminales se condensa en SCCs (Tarjan) y
+las componentes se agrupan por niveles: todas las componentes de un mismo
+nivel son independientes entre sí, así que se resuelven en paralelo en un
+pool de procesos y sus resultados se fusionan antes de pasar al siguiente.
+
+Los conjuntos obtenidos son los mismos que los del solver secuencial de
+LLParser; LLParser ordena después las listas de forma canónica en ambos
+caminos, así que el resultado final es idéntico.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+
+def strongly_connected_components(nodes, deps):
+    """
+    Tarjan iterativo. Devuelve las SCCs en orden topológico inverso:
+    cada componente aparece después de todas aquellas de las que depende.
+    """
+    index = {}
+    low = {}
+    on_stack = set()
+    stack = []
+    components = []
+    counter = 0
+
+    for root in nodes:
+        if root in index:
+            continue
+        work = [(root, iter(deps.get(root, ())))]
+        index[root] = low[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack.add(root)
+        while work:
+            node, it = work[-1]
+            advanced = False
+            for nxt in it:
+                if nxt not in index:
+                    index[nxt] = low[nxt] = counter
+                    counter += 1
+                    stack.append(nxt)
+                    on_stack.add(nxt)
+                    work.append((nxt, iter(deps.get(nxt, ()))))
+                    advanced = True
+                    break
+                if nxt in on_stack:
+                    low[node] = min(low[node], index[nxt])
+            if advanced:
+                continue
+            work.pop()
+            if work:
+                parent = work[-1][0]
+                low[parent] = min(low[parent], low[node])
+            if low[node] == index[node]:
+                component = []
+                while True:
+                    member = stack.pop()
+                    on_stack.discard(member)
+                    component.append(member)
+                    if member == node:
+                        break
+                components.append(component)
+    return components
+
+
+def dependency_levels(nodes, deps):
+    """
+    Agrupa las SCCs por niveles del DAG condensado. Las dependencias de una
+    componente del nivel k están en niveles < k (o en la propia componente).
+    """
+    components = strongly_connected_components(nodes, deps)
+    owner = {}
+    for cid, component in enumerate(components):
+        for node in component:
+            owner[node] = cid
+    level_of = []
+    levels = []
+    for cid, component in enumerate(components):
+        level = 0
+        for node in component:
+            for dep in deps.get(node, ()):
+                other = owner[dep]
+                if other != cid:
+                    level = max(level, level_of[other] + 1)
+        level_of.append(level)
+        if level == len(levels):
+            levels.append([])
+        levels[level].append(component)
+    return levels
+
+
+def _solve_first_batch(tasks, terminals, epsilon):
+    """Resuelve FIRST para un lote de componentes independientes."""
+    result = {}
+    for members, rules, known in tasks:
+        first = {A: [] for A in members}
+        seen = {A: set() for A in members}
+        lookup = dict(known)
+        lookup.update(first)
+        changed = True
+        while changed:
+            changed = False
+            for left, right in rules:
+                target = first[left]
+                target_seen = seen[left]
+                if right == [epsilon]:
+                    if epsilon not in target_seen:
+                        target.append(epsilon)
+                        target_seen.add(epsilon)
+                        changed = True
+                    continue
+                add_epsilon = True
+                for symbol in right:
+                    if symbol in terminals or symbol == epsilon:
+                        if symbol not in target_seen:
+                            target.append(symbol)
+                            target_seen.add(symbol)
+                            changed = True
+                        add_epsilon = False
+                        break
+                    source = lookup[symbol]
+                    for s in source:
+                        if s != epsilon and s not in target_seen:
+                            target.append(s)
+                            target_seen.add(s)
+                            changed = True
+                    if epsilon not in source:
+                        add_epsilon = False
+                        break
+                if add_epsilon and epsilon not in target_seen:
+                    target.append(epsilon)
+                    target_seen.add(epsilon)
+                    changed = True
+        result.update(first)
+    return result
+
+
+def _solve_follow_batch(tasks, terminals, epsilon):
+    """Resuelve FOLLOW para un lote de componentes independientes."""
+    result = {}
+    for members, occurrences, firsts, known, seed in tasks:
+        follow = {B: list(seed.get(B, ())) for B in members}
+        seen = {B: set(follow[B]) for B in members}
+        inherits = {B: [] for B in members}
+        # Parte directa: FIRST(gamma) \ {ε} para cada aparición de B
+        for B in members:
+            for left, gamma in occurrences.get(B, ()):
+                add_follow = True
+                for symbol in gamma:
+                    if symbol in terminals:
+                        if symbol not in seen[B]:
+                            follow[B].append(symbol)
+                            seen[B].add(symbol)
+                        add_follow = False
+                        break
+                    source = firsts[symbol]
+                    for s in source:
+                        if s != epsilon and s not in seen[B]:
+                            follow[B].append(s)
+                            seen[B].add(s)
+                    if epsilon not in source:
+                        add_follow = False
+                        break
+                if add_follow and left not in inherits[B]:
+                    inherits[B].append(left)
+        # Parte recursiva: FOLLOW(left) ⊆ FOLLOW(B) dentro de la componente
+        lookup = dict(known)
+        lookup.update(follow)
+        changed = True
+        while changed:
+            changed = False
+            for B in members:
+                for left in inherits[B]:
+                    for sym in lookup[left]:
+                        if sym not in seen[B]:
+                            follow[B].append(sym)
+                            seen[B].add(sym)
+                            changed = True
+        result.update(follow)
+    return result
+
+
+def _run_levels(levels, make_task, worker, terminals, epsilon, workers, check_cancel=None):
+    """
+    Ejecuta los niveles en orden, repartiendo cada uno en lotes.
+    `check_cancel` se llama antes de cada nivel y puede lanzar una excepción
+    para abandonar el cálculo.
+    """
+    solved = {}
+    executor = None
+    try:
+        for level in levels:
+            if check_cancel is not None:
+                check_cancel()
+            tasks = [make_task(component, solved) for component in level]
+            if workers <= 1 or len(tasks) == 1:
+                solved.update(worker(tasks, terminals, epsilon))
+                continue
+            if executor is None:
+                executor = ProcessPoolExecutor(max_workers=workers)
+            batches = [tasks[i::workers] for i in range(min(workers, len(tasks)))]
+            futures = [executor.submit(worker, batch, terminals, epsilon) for batch in batches]
+            for future in futures:
+                solved.update(future.result())
+    finally:
+        if executor is not None:
+            executor.shutdown()
+    return solved
+
+
+def nullable_nonterminals(nonterminals, rules, terminals, epsilon):
+    """
+    No terminales con ε en su FIRST, con las mismas reglas que
+    LLParser.calculate_first (un ε dentro de una derecha más larga también
+    aporta ε y corta el recorrido).
+    """
+    nullable = set()
+    changed = True
+    while changed:
+        changed = False
+        for left, right in rules:
+            if left in nullable:
+                continue
+            for symbol in right:
+                if symbol == epsilon:
+                    break
+                if symbol in terminals or symbol not in nullable:
+                    break
+            else:
+                nullable.add(left)
+                changed = True
+                continue
+            if symbol == epsilon:
+                nullable.add(left)
+                changed = True
+    return nullable
+
+
+def solve_first(nonterminals, rules, terminals, epsilon, workers=None, check_cancel=None):
+    """
+    Calcula FIRST de cada no terminal. `rules` es una lista de pares
+    (izquierda, derecha) en el mismo orden que LLParser.reglas.
+    """
+    workers = workers or os.cpu_count() or 1
+    terminals = frozenset(terminals)
+    by_left = {A: [] for A in nonterminals}
+    deps = {A: [] for A in nonterminals}
+    nullable = nullable_nonterminals(nonterminals, rules, terminals, epsilon)
+    for left, right in rules:
+        by_left[left].append((left, right))
+        # Sólo el prefijo anulable (hasta el primer símbolo no anulable)
+        # puede aportar a FIRST(left)
+        for symbol in right:
+            if symbol not in by_left:
+                break
+            if symbol not in deps[left]:
+                deps[left].append(symbol)
+            if symbol not in nullable:
+                break
+
+    def make_task(component, solved):
+        members = set(component)
+        comp_rules = [r for A in component for r in by_left[A]]
+        known = {B: solved[B] for A in component for B in deps[A] if B not in members}
+        return component, comp_rules, known
+
+    levels = dependency_levels(nonterminals, deps)
+    return _run_levels(levels, make_task, _solve_first_batch, terminals, epsilon, workers,
+                       check_cancel)
+
+
+def solve_follow(nonterminals, start, rules, terminals, epsilon, firsts, workers=None,
+                 check_cancel=None):
+    """
+    Calcula FOLLOW de cada no terminal a partir de los FIRST ya resueltos.
+    """
+    workers = workers or os.cpu_count() or 1
+    terminals = frozenset(terminals)
+    nonterminal_set = set(nonterminals)
+    occurrences = {B: [] for B in nonterminals}
+    deps = {B: [] for B in nonterminals}
+    for left, right in rules:
+        # tail_nullable[i]: todo lo que sigue a la posición i puede derivar
+        # ε; sólo entonces FOLLOW(left) se propaga a FOLLOW(right[i])
+        tail_nullable = [False] * len(right)
+        nullable_so_far = True
+        for i in range(len(right) - 1, -1, -1):
+            tail_nullable[i] = nullable_so_far
+            symbol = right[i]
+            nullable_so_far = nullable_so_far and symbol in nonterminal_set and epsilon in firsts[symbol]
+        for i, B in enumerate(right):
+            if B in nonterminal_set:
+                occurrences[B].append((left, right[i + 1:]))
+                if tail_nullable[i] and left not in deps[B]:
+                    deps[B].append(left)
+    seed = {start: ["$"]} if start else {}
+
+    def make_task(component, solved):
+        members = set(component)
+        comp_occ = {B: occurrences[B] for B in component}
+        comp_firsts = {
+            s: firsts[s]
+            for B in component
+            for _, gamma in occurrences[B]
+            for s in gamma
+            if s not in terminals and s in firsts
+        }
+        known = {L: solved[L] for B in component for L in deps[B] if L not in members}
+        comp_seed = {B: seed[B] for B in component if B in seed}
+        return component, comp_occ, comp_firsts, known, comp_seed
+
+    levels = dependency_levels(nonterminals, deps)
+    return _run_levels(levels, make_task, _solve_follow_batch, terminals, epsilon, workers,
+                       check_cancel)
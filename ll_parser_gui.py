@@ -1,12 +1,17 @@
 import tkinter as tk
 from tkinter import ttk, scrolledtext, messagebox
 import json
-from LL_parser import LLParser
+import queue
+import threading
+from LL_parser import LLParser, BuildCancelled
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 import networkx as nx
 from networkx.drawing.nx_pydot import graphviz_layout
 
+# Intervalo (ms) con el que el hilo de Tk revisa los resultados del worker
+POLL_MS = 50
+
 class LLParserGUI:
     def __init__(self, root):
         self.root = root
@@ -39,10 +44,104 @@ class LLParserGUI:
         self.setup_grammar_tab()
         self.setup_analysis_tab()
         self.setup_visualization_tab()
-        
+
+        # Status bar
+        self.status_var = tk.StringVar(value="Ready")
+        ttk.Label(self.main_frame, textvariable=self.status_var).pack(fill=tk.X, padx=5)
+
+        # Background jobs: un único worker consume self._jobs en orden y deja
+        # progreso/resultados en self._results, que se leen con root.after.
+        # Cada tipo de trabajo tiene un número de versión; un trabajo cuya
+        # versión ya no es la actual se descarta antes de ejecutarse y su
+        # resultado no se aplica.
+        self._versions = {"grammar": 0, "analyze": 0, "tree": 0}
+        self._jobs = queue.Queue()
+        self._results = queue.Queue()
+        self._active = 0
+        self._built = (None, None)  # (versión de gramática, LLParser) del worker
+        threading.Thread(target=self._worker_loop, daemon=True).start()
+        self.root.after(POLL_MS, self._poll_jobs)
+
         # Initialize parser
         self.parser = None
         self.load_grammar()
+
+    #########################################################
+    def _submit(self, kind, label, run, done, error):
+        """Encola un trabajo; invalida cualquier trabajo anterior del mismo tipo."""
+        self._versions[kind] += 1
+        job = {
+            "kind": kind,
+            "version": self._versions[kind],
+            "grammar_version": self._versions["grammar"],
+            "label": label,
+            "run": run,
+            "done": done,
+            "error": error,
+        }
+        self._active += 1
+        self.status_var.set(f"{label} (queued)")
+        self._jobs.put(job)
+
+    def _is_stale(self, job):
+        return (job["version"] != self._versions[job["kind"]]
+                or job["grammar_version"] != self._versions["grammar"])
+
+    def _worker_loop(self):
+        while True:
+            job = self._jobs.get()
+            if self._is_stale(job):
+                self._results.put((job, "skipped", None))
+                continue
+            self._results.put((job, "progress", job["label"]))
+            try:
+                self._results.put((job, "done", job["run"](job)))
+            except BuildCancelled:
+                self._results.put((job, "skipped", None))
+            except Exception as e:
+                self._results.put((job, "error", e))
+
+    def _poll_jobs(self):
+        try:
+            while True:
+                job, status, payload = self._results.get_nowait()
+                if status == "progress":
+                    self.status_var.set(payload)
+                    continue
+                self._active -= 1
+                if status == "skipped" or self._is_stale(job):
+                    continue
+                if status == "done":
+                    job["done"](payload)
+                else:
+                    job["error"](payload)
+        except queue.Empty:
+            pass
+        if self._active == 0:
+            self.status_var.set("Ready")
+        self.root.after(POLL_MS, self._poll_jobs)
+
+    def _build_parser(self, text, job):
+        # Se ejecuta en el worker; se interrumpe entre fases si el trabajo
+        # queda obsoleto
+        parser = LLParser(grammar_text=text, cancel_check=lambda: self._is_stale(job))
+        self._built = (job["grammar_version"], parser)
+        return parser
+
+    def _parser_for(self, job):
+        # Se ejecuta en el worker: el parser construido para la versión de
+        # gramática del trabajo o, si esa construcción falló, el aplicado
+        version, parser = self._built
+        if version == job["grammar_version"]:
+            return parser
+        if self.parser is None:
+            raise RuntimeError("No grammar loaded")
+        return self.parser
+
+    def _apply_parser(self, parser, message):
+        self.parser = parser
+        self.update_grammar_info()
+        messagebox.showinfo("Success", message)
         
     def setup_grammar_tab(self):
         # Grammar input
@@ -138,28 +237,44 @@ class LLParserGUI:
 
     #########################################################
     def load_grammar(self):
-        try:
-            with open("grammar.txt", "r") as f:
-                self.grammar_text.delete(1.0, tk.END)
-                self.grammar_text.insert(tk.END, f.read())
-            self.parser = LLParser()
-            self.update_grammar_info()
-            messagebox.showinfo("Success", "Grammar loaded successfully")
-        except Exception as e:
+        def failed(e):
             msg = str(e).strip()
             if not msg:
                 msg = "Unknown error. Please check your grammar file for empty or invalid lines."
             messagebox.showerror("Error", f"Failed to load grammar: {msg}")
-            
+
+        try:
+            with open("grammar.txt", "r") as f:
+                text = f.read()
+            self.grammar_text.delete(1.0, tk.END)
+            self.grammar_text.insert(tk.END, text)
+        except Exception as e:
+            failed(e)
+            return
+        self._submit(
+            "grammar", "Building parse table...",
+            lambda job: self._build_parser(text, job),
+            lambda parser: self._apply_parser(parser, "Grammar loaded successfully"),
+            failed,
+        )
+
     def save_grammar(self):
+        def failed(e):
+            messagebox.showerror("Error", f"Failed to save grammar: {str(e)}")
+
+        text = self.grammar_text.get(1.0, tk.END)
         try:
             with open("grammar.txt", "w") as f:
-                f.write(self.grammar_text.get(1.0, tk.END))
-            self.parser = LLParser()
-            self.update_grammar_info()
-            messagebox.showinfo("Success", "Grammar saved successfully")
+                f.write(text)
         except Exception as e:
-            messagebox.showerror("Error", f"Failed to save grammar: {str(e)}")
+            failed(e)
+            return
+        self._submit(
+            "grammar", "Building parse table...",
+            lambda job: self._build_parser(text, job),
+            lambda parser: self._apply_parser(parser, "Grammar saved successfully"),
+            failed,
+        )
             
     def validate_grammar(self):
         if not self.parser:
@@ -167,18 +282,24 @@ class LLParserGUI:
             return
             
         try:
-            # Check for LL(1) conditions
-            conflicts = []
-            for var in self.parser.variables + self.parser.start:
-                for term in self.parser.terminales + ["$"]:
-                    if len(self.parser.tabla[var][term]) > 1:
-                        conflicts.append(f"Conflict in {var} for terminal {term}")
-                        
+            # Conflictos LL(1) registrados al construir la tabla
+            conflicts = self.parser.get_conflicts()
+
             if conflicts:
                 self.info_text.delete(1.0, tk.END)
                 self.info_text.insert(tk.END, "Grammar is not LL(1):\n")
                 for conflict in conflicts:
-                    self.info_text.insert(tk.END, f"- {conflict}\n")
+                    self.info_text.insert(
+                        tk.END,
+                        f"- Conflict in {conflict['nonterminal']} for terminal {conflict['terminal']}\n"
+                    )
+                    for prod in conflict["productions"]:
+                        rule = prod["rule"]
+                        path = " ".join(prod["nullable_path"]) or "-"
+                        self.info_text.insert(
+                            tk.END,
+                            f"    {rule['Izq']} → {' '.join(rule['Der'])}  [{prod['source']}, nullable: {path}]\n"
+                        )
                 messagebox.showwarning("Warning", "Grammar is not LL(1)")
             else:
                 self.info_text.delete(1.0, tk.END)
@@ -210,38 +331,42 @@ class LLParserGUI:
             self.info_text.insert(tk.END, f"{var}: {', '.join(info['follow_sets'][var])}\n")
             
     def analyze_string(self):
-        if not self.parser:
+        if not self.parser and self._active == 0:
             messagebox.showerror("Error", "No grammar loaded")
             return
         input_string = self.input_text.get().strip()
         if not input_string:
             messagebox.showerror("Error", "Please enter an input string")
             return
-        try:
-            valid, steps = self.parser.analyze_string(input_string)
-            self.output_text.delete(1.0, tk.END)
-            if valid:
-                self.output_text.insert(tk.END, "String es válido :D\n\n")
+        self._submit(
+            "analyze", "Parsing input...",
+            lambda job: self._parser_for(job).analyze_string(input_string),
+            self._show_analysis,
+            lambda e: messagebox.showerror("Error", f"Analysis failed: {str(e)}"),
+        )
+
+    def _show_analysis(self, result):
+        valid, steps = result
+        self.output_text.delete(1.0, tk.END)
+        if valid:
+            self.output_text.insert(tk.END, "String es válido :D\n\n")
+        else:
+            self.output_text.insert(tk.END, "String es invalido :(!\n\n")
+        # Encabezado de la tabla
+        header = f"{'Stack':<30} {'Input':<40} {'Rule':<40}"
+        separator = "-" * (30 + 40 + 40)
+        self.output_text.insert(tk.END, header + "\n")
+        self.output_text.insert(tk.END, separator + "\n")
+        # Mostrar pasos (en un solo insert para no redibujar por línea)
+        lines = []
+        for idx, step in enumerate(steps):
+            if len(step) == 3:
+                stack, input_str, rule = step
             else:
-                self.output_text.insert(tk.END, "String es invalido :(!\n\n")
-            # Encabezado de la tabla
-            header = f"{'Stack':<30} {'Input':<40} {'Rule':<40}"
-            separator = "-" * (30 + 40 + 40)
-            self.output_text.insert(tk.END, header + "\n")
-            self.output_text.insert(tk.END, separator + "\n")
-            # Mostrar pasos
-            for idx, step in enumerate(steps):
-                if len(step) == 3:
-                    stack, input_str, rule = step
-                else:
-                    stack, input_str = step
-                    rule = "-"
-                self.output_text.insert(
-                    tk.END,
-                    f"{stack:<30} {input_str:<40} {rule:<40}\n"
-                )
-        except Exception as e:
-            messagebox.showerror("Error", f"Analysis failed: {str(e)}")
+                stack, input_str = step
+                rule = "-"
+            lines.append(f"{stack:<30} {input_str:<40} {rule:<40}\n")
+        self.output_text.insert(tk.END, "".join(lines))
 
     def step_by_step(self):
         if not self.parser:
@@ -284,20 +409,9 @@ class LLParserGUI:
         ax.axis('tight')
         ax.axis('off')
 
-        terminals = self.parser.terminales + ["$"]
-        variables = self.parser.variables + self.parser.start
-
-        # build rows, usando '-' cuando no haya regla
-        table_data = []
-        for var in variables:
-            row = [var]
-            for term in terminals:
-                prods = self.parser.tabla[var][term]
-                if prods:
-                    row.append("\n".join(f"{r['Izq']}→{' '.join(r['Der'])}" for r in prods))
-                else:
-                    row.append("-")   # <-- guión en lugar de cadena vacía
-            table_data.append(row)
+        # filas desde la vista cacheada del parser ('-' cuando no hay regla)
+        header, table_data = self.parser.get_parsing_table(multiline=True)
+        terminals = header[1:]
 
         # dibuja la tabla con headers
         table = ax.table(
@@ -316,19 +430,23 @@ class LLParserGUI:
 
 
     def show_derivation_tree(self):
-            # limpia la zona de visualización
-            for w in self.visualization_frame.winfo_children():
-                w.destroy()
-
             s = self.input_text.get().strip()
             if not s:
                 messagebox.showerror("Error", "Please enter an input string")
                 return
 
-            valid, steps = self.parser.analyze_string(s)
+            self._submit(
+                "tree", "Building derivation tree...",
+                lambda job: self._layout_derivation_tree(self._parser_for(job), s),
+                self._draw_derivation_tree,
+                lambda e: messagebox.showerror("Error", f"Derivation tree failed: {str(e)}"),
+            )
+
+    def _layout_derivation_tree(self, parser, s):
+            # Se ejecuta en el worker: análisis, árbol y layout de graphviz
+            valid, steps = parser.analyze_string(s)
             if not valid:
-                messagebox.showerror("Error", "Cannot show derivation tree for invalid string")
-                return
+                return None
 
             # 1) extraemos sólo los pasos de expansión (producciones)
             expansions = [rule for _, _, rule in steps if '->' in rule]
@@ -341,7 +459,7 @@ class LLParserGUI:
                     self.children = []
 
             # 3) construimos el árbol de derivación en pre-orden usando una cola
-            root = PNode(self.parser.start[0])
+            root = PNode(parser.start[0])
             queue = [root]
             for prod in expansions:
                 left, right = prod.split("->", 1)
@@ -351,7 +469,7 @@ class LLParserGUI:
                 for node in queue:
                     if node.symbol == A and not node.children:
                         for sym in rhs:
-                            if sym != self.parser.epsilon:
+                            if sym != parser.epsilon:
                                 child = PNode(sym)
                                 node.children.append(child)
                                 queue.append(child)
@@ -369,13 +487,24 @@ class LLParserGUI:
             G.add_node("root", label=root.symbol)
             add_edges(root, "root")
 
-            # 5) dibujamos con layout tipo árbol de graphviz
-            fig, ax = plt.subplots(figsize=(10, 6))
+            # 5) layout tipo árbol de graphviz
             try:
                 pos = graphviz_layout(G, prog="dot", root="root")
             except Exception:
                 pos = nx.nx_agraph.graphviz_layout(G, prog="dot", root="root")
+            return G, pos
 
+    def _draw_derivation_tree(self, layout):
+            if layout is None:
+                messagebox.showerror("Error", "Cannot show derivation tree for invalid string")
+                return
+            G, pos = layout
+
+            # limpia la zona de visualización
+            for w in self.visualization_frame.winfo_children():
+                w.destroy()
+
+            fig, ax = plt.subplots(figsize=(10, 6))
             labels = nx.get_node_attributes(G, "label")
             nx.draw(
                 G, pos, ax=ax, labels=labels, with_labels=True,
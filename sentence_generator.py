@@ -0,0 +1,335 @@
+"""
+Generador de cadenas a partir de una gramática LL(1).
+
+Usa LLParser.reglas y la tabla de análisis para:
+  – calcular la longitud mínima de derivación de cada no terminal,
+  – generar cadenas aleatorias de una longitud objetivo de forma perezosa,
+  – producir un conjunto mínimo de cadenas que cubre todas las celdas no
+    vacías de parser.tabla,
+  – producir cadenas casi válidas que caen en las celdas EXT/EP de la tabla
+    de recuperación de errores.
+
+Uso:
+    python sentence_generator.py [cantidad] [longitud] [grammar.txt]
+"""
+import random
+import sys
+import time
+from LL_parser import LLParser
+
+INF = float("inf")
+
+
+class SentenceGenerator:
+    def __init__(self, parser):
+        self.parser = parser
+        self.epsilon = parser.epsilon
+        self.terminals = set(parser.terminales)
+        self.nonterminals = parser.start + parser.variables
+        # Reglas de cada no terminal con la derecha sin ε: A -> [(regla, símbolos)]
+        self.options = {A: [] for A in self.nonterminals}
+        for rule in parser.reglas.values():
+            right = tuple(s for s in rule["Der"] if s != self.epsilon)
+            self.options[rule["Izq"]].append((rule, right))
+        self.min_len, self.min_rule = self._min_lengths()
+        self._min_yield = {}
+        self._choices = {
+            A: [(right, self._seq_min(right), tuple(reversed(right))) for _, right in opts]
+            for A, opts in self.options.items()
+        }
+        self._starts = None
+        self._contexts = None
+        self._shortest = None
+
+    # ——— Longitudes mínimas ———
+    def _min_lengths(self):
+        """
+        Punto fijo con mejora estricta: la regla registrada para cada no
+        terminal lleva siempre a una derivación finita de longitud mínima.
+        """
+        min_len = {A: INF for A in self.nonterminals}
+        min_rule = {}
+        changed = True
+        while changed:
+            changed = False
+            for A, opts in self.options.items():
+                for _, right in opts:
+                    total = sum(1 if s in self.terminals else min_len[s] for s in right)
+                    if total < min_len[A]:
+                        min_len[A] = total
+                        min_rule[A] = right
+                        changed = True
+        return min_len, min_rule
+
+    def _seq_min(self, symbols):
+        return sum(1 if s in self.terminals else self.min_len[s] for s in symbols)
+
+    def min_yield(self, symbol):
+        """Cadena terminal más corta derivable desde `symbol` (lista)."""
+        if symbol in self.terminals:
+            return [symbol]
+        if symbol not in self._min_yield:
+            if self.min_len[symbol] == INF:
+                raise ValueError(f"{symbol} does not derive any terminal string")
+            out = []
+            stack = [symbol]
+            while stack:
+                sym = stack.pop()
+                if sym in self.terminals:
+                    out.append(sym)
+                else:
+                    stack.extend(reversed(self.min_rule[sym]))
+            self._min_yield[symbol] = out
+        return self._min_yield[symbol]
+
+    def _seq_yield(self, symbols):
+        out = []
+        for s in symbols:
+            out.extend(self.min_yield(s))
+        return out
+
+    # ——— Cadenas aleatorias ———
+    def sentences(self, length, count=None, seed=None):
+        """
+        Genera perezosamente cadenas aleatorias de a lo sumo `length` tokens
+        (o la mínima posible si la gramática no permite menos). Con
+        count=None el flujo es infinito.
+        """
+        if not self.nonterminals:
+            return
+        if self.min_len[self.nonterminals[0]] == INF:
+            raise ValueError(f"{self.nonterminals[0]} does not derive any terminal string")
+        rnd = random.Random(seed)
+        choice = rnd.choice
+        start = self.nonterminals[0]
+        terminals = self.terminals
+        min_len = self.min_len
+        choices = self._choices
+        min_rev = {A: tuple(reversed(r)) for A, r in self.min_rule.items()}
+        max_steps = 50 * length + 100
+        produced = 0
+        while count is None or produced < count:
+            out = []
+            stack = [start]
+            pending = min_len[start]
+            steps = 0
+            while stack:
+                sym = stack.pop()
+                if sym in terminals:
+                    out.append(sym)
+                    pending -= 1
+                    continue
+                pending -= min_len[sym]
+                steps += 1
+                budget = length - len(out) - pending
+                fitting = [c for c in choices[sym] if c[1] <= budget] if steps < max_steps else None
+                if fitting:
+                    _, cost, rev = choice(fitting)
+                else:
+                    rev = min_rev[sym]
+                    cost = min_len[sym]
+                stack.extend(rev)
+                pending += cost
+            yield " ".join(out)
+            produced += 1
+
+    # ——— Cobertura de la tabla ———
+    def _start_strings(self):
+        """
+        starts[A][t]: cadena terminal más corta derivada de A cuyo primer
+        token es t.
+        """
+        if self._starts is not None:
+            return self._starts
+        starts = {A: {} for A in self.nonterminals}
+        changed = True
+        while changed:
+            changed = False
+            for A, opts in self.options.items():
+                for _, right in opts:
+                    for t, s in self._seq_starts(right, starts).items():
+                        if t not in starts[A] or len(s) < len(starts[A][t]):
+                            starts[A][t] = s
+                            changed = True
+        self._starts = starts
+        return starts
+
+    def _seq_starts(self, symbols, starts=None):
+        """Para una secuencia de símbolos: {t: cadena más corta que empieza por t}."""
+        starts = self._start_strings() if starts is None else starts
+        found = {}
+        prefix_empty = True
+        for i, sym in enumerate(symbols):
+            if not prefix_empty:
+                break
+            if sym in self.terminals:
+                heads = {sym: [sym]}
+            else:
+                heads = starts[sym]
+            if heads:
+                rest = self._seq_yield(symbols[i + 1:]) if self._seq_min(symbols[i + 1:]) < INF else None
+                if rest is not None:
+                    for t, s in heads.items():
+                        cand = s + rest
+                        if t not in found or len(cand) < len(found[t]):
+                            found[t] = cand
+            prefix_empty = sym not in self.terminals and self.min_len[sym] == 0
+        return found
+
+    def _context_table(self):
+        """
+        contexts[(A, t)] = (w, sufijo): derivación por la izquierda
+        S =>* w A γ donde γ deriva `sufijo`, que empieza por t ('$' = fin).
+        """
+        if self._contexts is not None:
+            return self._contexts
+        contexts = {}
+        if self.nonterminals:
+            root = (self.nonterminals[0], "$")
+            contexts[root] = ([], [])
+            queue = [root]
+            for B, f in queue:
+                w, suffix = contexts[(B, f)]
+                for _, right in self.options[B]:
+                    if self._seq_min(right) == INF:
+                        continue
+                    for i, X in enumerate(right):
+                        if X in self.terminals:
+                            continue
+                        prefix = w + self._seq_yield(right[:i])
+                        rest = right[i + 1:]
+                        follows = {t: s + suffix for t, s in self._seq_starts(rest).items()}
+                        if self._seq_min(rest) == 0:
+                            follows.setdefault(f, suffix)
+                        for t, tail in follows.items():
+                            if (X, t) not in contexts:
+                                contexts[(X, t)] = (prefix, tail)
+                                queue.append((X, t))
+        self._contexts = contexts
+        return contexts
+
+    def _any_context(self, A):
+        """Contexto más corto para A, sin importar el token que le sigue."""
+        if self._shortest is None:
+            self._shortest = {}
+            for (X, _), (w, suffix) in self._context_table().items():
+                best = self._shortest.get(X)
+                if best is None or len(w) + len(suffix) < len(best[0]) + len(best[1]):
+                    self._shortest[X] = (w, suffix)
+        return self._shortest.get(A)
+
+    def expansions(self, tokens):
+        """
+        Simula el análisis y devuelve (válido, celdas (A, t) usadas, celda
+        (A, t) en la que falló o None).
+        """
+        tabla = self.parser.tabla
+        tokens = list(tokens) + ["$"]
+        stack = ["$"] + self.parser.start[::-1]
+        pos = 0
+        used = set()
+        # Sin recursión izquierda, por token hay como mucho una expansión por
+        # no terminal más los pops de ε; superar el límite indica un ciclo
+        # (p. ej. S -> S a) y se trata como fallo
+        max_rhs = max((len(r) for opts in self.options.values() for _, r in opts), default=0)
+        max_steps = len(tokens) * (len(self.nonterminals) + 1) * (max_rhs + 1)
+        steps = 0
+        while True:
+            steps += 1
+            if steps > max_steps:
+                return False, used, None
+            top, current = stack[-1], tokens[pos]
+            if top == "$" and current == "$":
+                return True, used, None
+            if top in tabla:
+                entry = tabla[top].get(current, [])
+                if not entry:
+                    return False, used, (top, current)
+                used.add((top, current))
+                stack.pop()
+                stack.extend(reversed([s for s in entry[0]["Der"] if s != self.epsilon]))
+                continue
+            if top == current:
+                stack.pop()
+                pos += 1
+                continue
+            return False, used, None
+
+    def coverage_sentences(self):
+        """
+        Conjunto mínimo (voraz) de cadenas que en conjunto expanden todas las
+        celdas no vacías de parser.tabla. Devuelve (cadenas, celdas sin cubrir).
+        """
+        contexts = self._context_table()
+        candidates = {}
+        for A in self.nonterminals:
+            for t, entry in self.parser.tabla[A].items():
+                if not entry:
+                    continue
+                right = tuple(s for s in entry[0]["Der"] if s != self.epsilon)
+                heads = self._seq_starts(right)
+                if t in heads and self._any_context(A):
+                    w, suffix = self._any_context(A)
+                    tokens = w + heads[t] + suffix
+                elif self._seq_min(right) == 0 and (A, t) in contexts:
+                    w, suffix = contexts[(A, t)]
+                    tokens = w + self._seq_yield(right) + suffix
+                else:
+                    continue
+                sentence = " ".join(tokens)
+                if sentence not in candidates:
+                    valid, used, _ = self.expansions(tokens)
+                    if valid:
+                        candidates[sentence] = used
+        targets = {(A, t) for A in self.nonterminals for t, e in self.parser.tabla[A].items() if e}
+        remaining = set(targets)
+        chosen = []
+        while remaining and candidates:
+            best = max(candidates, key=lambda s: (len(candidates[s] & remaining), -len(s)))
+            gain = candidates.pop(best) & remaining
+            if not gain:
+                break
+            chosen.append(best)
+            remaining -= gain
+        return chosen, sorted(remaining)
+
+    def near_misses(self):
+        """
+        Cadenas inválidas que fallan en una celda vacía (A, t) marcada como
+        EXT o EP en la tabla de recuperación. Devuelve tuplas
+        (cadena, A, t, acción).
+        """
+        header, rows = self.parser.get_error_recovery_table()
+        contexts = self._context_table()
+        result = []
+        for row in rows:
+            A = row[0]
+            for t, action in zip(header[1:], row[1:]):
+                if action not in ("EXT", "EP") or self.parser.tabla[A][t]:
+                    continue
+                if action == "EXT" and (A, t) in contexts:
+                    # Falta A: el siguiente token ya es de FOLLOW(A)
+                    w, suffix = contexts[(A, t)]
+                    tokens = w + suffix
+                elif action == "EP" and t != "$" and self._any_context(A):
+                    # Token sobrante antes de A
+                    w, suffix = self._any_context(A)
+                    tokens = w + [t] + self.min_yield(A) + suffix
+                else:
+                    continue
+                valid, _, failed = self.expansions(tokens)
+                if not valid and failed == (A, t):
+                    result.append((" ".join(tokens), A, t, action))
+        return result
+
+
+if __name__ == "__main__":
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    length = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    gen = SentenceGenerator(LLParser(sys.argv[3] if len(sys.argv) > 3 else "grammar.txt"))
+    t0 = time.perf_counter()
+    out = sys.stdout
+    for sentence in gen.sentences(length, count):
+        out.write(sentence + "\n")
+    elapsed = time.perf_counter() - t0
+    print(f"{count} sentences in {elapsed:.2f}s ({count / elapsed * 60:,.0f}/min)", file=sys.stderr)
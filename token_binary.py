@@ -0,0 +1,230 @@
+"""
+Formato binario de tokens y análisis LL(1) directamente sobre un mmap.
+
+Estructura del archivo (little-endian):
+
+    0   4s  magic b"LLTK"
+    4   B   versión
+    5   B   ancho de cada id en bytes (2 o 4)
+    6   H   reservado
+    8   Q   número de tokens
+    16  I   número de terminales del diccionario
+    20  ... por cada terminal: H longitud + bytes UTF-8
+        ... relleno hasta múltiplo de 8
+        ... array empaquetado de ids (uint16 o uint32)
+
+El id igual a len(diccionario) marca un token desconocido. El '$' final no
+se guarda: el driver lo añade al llegar al final del array.
+
+Uso:
+    python token_binary.py write entrada.txt salida.tok [grammar.txt]
+    python token_binary.py parse salida.tok [grammar.txt]
+"""
+import mmap
+import struct
+import sys
+from array import array
+from LL_parser import LLParser
+
+MAGIC = b"LLTK"
+VERSION = 1
+_FIXED = struct.Struct("<4sBBHQI")
+_COUNT_OFFSET = 8
+_TYPECODES = {2: "H", 4: "I"}
+CHUNK_TOKENS = 1 << 16
+READ_BYTES = 1 << 20
+
+
+def _typecode(width):
+    # array/memoryview usan el orden nativo; 'I' puede no ser de 4 bytes
+    code = _TYPECODES[width]
+    if array(code).itemsize != width:
+        code = "L" if array("L").itemsize == width else None
+    if code is None:
+        raise ValueError(f"Unsupported id width: {width}")
+    return code
+
+
+def _iter_text_tokens(text_file):
+    """Tokeniza un archivo de texto por espacios, leyendo por bloques."""
+    rest = ""
+    while True:
+        chunk = text_file.read(READ_BYTES)
+        if not chunk:
+            break
+        parts = (rest + chunk).split()
+        if chunk[-1].isspace():
+            rest = ""
+        else:
+            rest = parts.pop() if parts else ""
+        yield from parts
+    if rest:
+        yield rest
+
+
+def write_token_file(terminals, text_path, out_path):
+    """
+    Convierte un archivo de texto (tokens separados por espacios) al formato
+    binario, usando `terminals` (p. ej. parser.terminales) como diccionario.
+    Devuelve el número de tokens escritos.
+    """
+    terminals = list(terminals)
+    unknown = len(terminals)
+    width = 2 if unknown <= 0xFFFF else 4
+    code = _typecode(width)
+    ids = {t: i for i, t in enumerate(terminals)}
+    swap = sys.byteorder != "little"
+
+    header = bytearray(_FIXED.pack(MAGIC, VERSION, width, 0, 0, len(terminals)))
+    for t in terminals:
+        raw = t.encode("utf-8")
+        header += struct.pack("<H", len(raw)) + raw
+    header += b"\0" * (-len(header) % 8)
+
+    count = 0
+    with open(text_path, "r", encoding="utf-8") as src, open(out_path, "wb") as out:
+        out.write(header)
+        buf = array(code)
+        for tok in _iter_text_tokens(src):
+            buf.append(ids.get(tok, unknown))
+            if len(buf) >= CHUNK_TOKENS:
+                if swap:
+                    buf.byteswap()
+                buf.tofile(out)
+                count += len(buf)
+                buf = array(code)
+        if swap:
+            buf.byteswap()
+        buf.tofile(out)
+        count += len(buf)
+        out.seek(_COUNT_OFFSET)
+        out.write(struct.pack("<Q", count))
+    return count
+
+
+def read_token_header(buf):
+    """Devuelve (ancho, número de tokens, diccionario, offset de datos)."""
+    magic, version, width, _, count, n_terms = _FIXED.unpack_from(buf, 0)
+    if magic != MAGIC:
+        raise ValueError("Not a token file")
+    if version != VERSION:
+        raise ValueError(f"Unsupported token file version: {version}")
+    pos = _FIXED.size
+    terminals = []
+    for _ in range(n_terms):
+        (length,) = struct.unpack_from("<H", buf, pos)
+        pos += 2
+        terminals.append(bytes(buf[pos:pos + length]).decode("utf-8"))
+        pos += length
+    pos += -pos % 8
+    return width, count, terminals, pos
+
+
+def compile_table(parser):
+    """
+    Traduce self.tabla a listas indexadas por enteros. Códigos de símbolo:
+    terminales 0..T-1, '$' = T, desconocido = T+1, no terminales desde T+2.
+    Cada celda guarda la parte derecha ya invertida (lista de códigos) o None.
+    """
+    terminals = parser.terminales
+    end = len(terminals)
+    base = end + 2
+    nonterminals = parser.start + parser.variables
+    code = {t: i for i, t in enumerate(terminals)}
+    code["$"] = end
+    for i, A in enumerate(nonterminals):
+        code[A] = base + i
+    rows = []
+    for A in nonterminals:
+        row = [None] * base
+        for t, entry in parser.tabla[A].items():
+            if entry:
+                right = entry[0]["Der"]
+                if right == [parser.epsilon]:
+                    row[code[t]] = []
+                else:
+                    row[code[t]] = [code[s] for s in reversed(right)]
+        rows.append(row)
+    return code, rows
+
+
+def parse_token_buffer(parser, buf):
+    """
+    Analiza un buffer en formato binario sin decodificar los tokens.
+    Devuelve (válido, posición del token donde se detuvo el análisis).
+    """
+    width, count, dictionary, offset = read_token_header(buf)
+    code, rows = compile_table(parser)
+    end = len(parser.terminales)
+    unknown = end + 1
+    base = end + 2
+    remap = [code.get(t, unknown) if t != "$" else unknown for t in dictionary] + [unknown]
+
+    stack = [end, code[parser.start[0]]] if parser.start else [end]
+    pos = 0
+    # Las vistas se liberan al salir de cada bloque para poder cerrar el mmap
+    with memoryview(buf) as view, view[offset:offset + count * width] as data:
+        for start_idx in range(0, count, CHUNK_TOKENS):
+            stop_idx = min(start_idx + CHUNK_TOKENS, count)
+            with data[start_idx * width:stop_idx * width] as raw:
+                if sys.byteorder == "little":
+                    with raw.cast(_typecode(width)) as chunk:
+                        ok = _feed(chunk, remap, rows, stack, end, base)
+                else:
+                    chunk = array(_typecode(width))
+                    chunk.frombytes(raw)
+                    chunk.byteswap()
+                    ok = _feed(chunk, remap, rows, stack, end, base)
+            if ok < stop_idx - start_idx:
+                return False, pos + ok
+            pos += ok
+    # Fin de la entrada: se procesa '$'
+    if _feed((end,), None, rows, stack, end, base) == 1:
+        return True, pos
+    return False, pos
+
+
+def _feed(chunk, remap, rows, stack, end, base):
+    """
+    Consume los ids de `chunk` sobre la pila. Devuelve cuántos tokens se
+    aceptaron; si es menor que len(chunk), el análisis falló en ese token.
+    """
+    tokens = map(remap.__getitem__, chunk) if remap is not None else chunk
+    accepted = 0
+    for tok in tokens:
+        while True:
+            top = stack[-1]
+            if top >= base:
+                rhs = rows[top - base][tok]
+                if rhs is None:
+                    return accepted
+                stack.pop()
+                stack.extend(rhs)
+                continue
+            if top == tok:
+                stack.pop()
+                break
+            return accepted
+        accepted += 1
+    return accepted
+
+
+def parse_token_file(parser, path):
+    """Analiza un archivo binario de tokens mapeándolo en memoria."""
+    with open(path, "rb") as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return parse_token_buffer(parser, mm)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 3 or sys.argv[1] not in ("write", "parse"):
+        print(__doc__)
+        sys.exit(1)
+    if sys.argv[1] == "write":
+        parser = LLParser(sys.argv[4] if len(sys.argv) > 4 else "grammar.txt")
+        n = write_token_file(parser.terminales, sys.argv[2], sys.argv[3])
+        print(f"{n} tokens written to {sys.argv[3]}")
+    else:
+        parser = LLParser(sys.argv[3] if len(sys.argv) > 3 else "grammar.txt")
+        valid, pos = parse_token_file(parser, sys.argv[2])
+        print(f"Valid: {valid} (stopped at token {pos})")